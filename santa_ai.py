@@ -4,13 +4,27 @@ Santa AI - Interactive Gift Selection Assistant
 Powered by SignalWire and RapidAPI
 """
 
+import logging
+import itertools
 import random
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, Final, List, Optional, Tuple
 from signalwire_agents import AgentBase, AgentServer
 from signalwire_agents.core.function_result import SwaigFunctionResult
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from uvicorn.config import LOG_LEVELS as UVICORN_LOG_LEVELS
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -19,6 +33,369 @@ load_dotenv()
 HOST = os.getenv('HOST', '0.0.0.0')
 PORT = int(os.getenv('PORT', 5000))
 
+# Dump complete SWAIG results (children's names included) to the debug log
+SANTA_DEBUG: Final[bool] = os.getenv('SANTA_DEBUG', '0') == '1'
+
+logger = logging.getLogger("santa")
+log_level = (os.getenv('LOG_LEVEL') or ('DEBUG' if SANTA_DEBUG else 'INFO')).upper()
+if log_level in logging.getLevelNamesMapping():
+    logger.setLevel(log_level)
+else:
+    # A typo in LOG_LEVEL shouldn't keep Santa from starting
+    logger.setLevel(logging.INFO)
+    logger.warning("Unknown LOG_LEVEL %r, using INFO", log_level)
+
+# uvicorn logs every request at INFO; "warning" drops the access log
+UVICORN_LOG_LEVEL = (os.getenv('UVICORN_LOG_LEVEL') or 'warning').lower()
+if UVICORN_LOG_LEVEL not in UVICORN_LOG_LEVELS:
+    # uvicorn raises KeyError at startup for names it doesn't know
+    logger.warning("Unknown UVICORN_LOG_LEVEL %r, using warning", UVICORN_LOG_LEVEL)
+    UVICORN_LOG_LEVEL = 'warning'
+
+# Longest a search may sleep waiting for a RapidAPI rate-limit slot. Searches
+# run on the server's event loop, so any sleep here stalls every other caller;
+# past this budget the search falls back to mock products instead.
+RAPIDAPI_MAX_WAIT = 1.0
+
+# RapidAPI (connect, read) timeouts in seconds. Searches run on the server's
+# event loop, so a short connect timeout keeps an unreachable API from
+# stalling every other caller for the full read timeout.
+RAPIDAPI_TIMEOUT = (3.05, 10)
+
+# Prompt sections describing Santa's personality and how to run the call
+PROMPT_PERSONALITY: Final[str] = """You are Santa Claus, speaking directly to a child who has called you at the North Pole.
+You're jolly, warm, and magical. You love to hear what children want for Christmas and help them
+choose the perfect gift. Use phrases like "Ho ho ho!", "Merry Christmas!", and refer to your
+workshop, elves, and reindeer. Keep responses cheerful but concise - remember you're having
+a phone conversation with an excited child."""
+
+PROMPT_CONVERSATION_FLOW: Final[str] = """Follow these conversation states:
+
+1. GREETING: Welcome the child warmly, ask their name, and find out what they'd like for Christmas
+2. COLLECTING_WISHES: Listen to what gifts they're interested in, ask clarifying questions if needed
+3. SEARCHING_GIFTS: Let them know you're checking your workshop and Amazon's catalog
+4. PRESENTING_OPTIONS: Present up to 3 gift options enthusiastically
+5. CONFIRMING_SELECTION: Help them choose ONE gift (gently explain they can only pick one)
+6. SENDING_GIFT: Confirm you'll send the gift details to their parents
+
+Always maintain the magic of Christmas and never break character."""
+
+PROMPT_SPEECH_PATTERNS: Final[str] = """Use natural speech patterns including:
+- "Ho ho ho!" when greeting or expressing joy
+- "Let me check my list..." when searching
+- "Oh my!" when surprised
+- "Wonderful choice!" when they select something
+- "The elves will love making this!" when confirming
+
+Add natural pauses with filler words like "hmm", "let's see", "ah yes" to sound more natural."""
+
+PROMPT_AVAILABLE_TOOLS: Final[str] = """You have access to these magical tools to help children:
+
+1. search_gifts - Use this when a child tells you what they want for Christmas.
+   This searches both Santa's workshop and Amazon's catalog.
+   Example: If a child says "I want Legos", use search_gifts with query="lego sets"
+
+2. select_gift - Use this after presenting options to confirm which gift they chose.
+   This records their selection and shows it on the screen.
+
+3. check_nice_list - Use this when a child asks if they're on the nice list or
+   when you want to check their behavior status. Always use their name.
+
+IMPORTANT: You MUST use these tools during the conversation!
+- When a child mentions what they want → use search_gifts
+- After they pick from options → use select_gift
+- When checking nice list → use check_nice_list"""
+
+# Summary requested from the AI when POST_PROMPT_URL is configured
+POST_PROMPT_TEXT: Final[str] = "Summarize the conversation, including all the gifts discussed, the child's preferences, their selected gift if any, and any special mentions about their Christmas wishes."
+
+
+# Answers for check_nice_list, formatted with the child's name
+NICE_LIST_TEMPLATES: Final[Tuple[str, ...]] = (
+    "Let me check my big magical book here at the North Pole... *pages rustling*... Oh yes! I found it! {name} is definitely on the NICE LIST! You've been wonderful this year!",
+    "Ho ho ho! {name}! Let me see... *checking list twice*... YES! You're on my nice list! I can see all the kind things you've done this year!",
+    "My special list says {name} has been absolutely wonderful! The elves have been telling me such good things about you! Keep up the fantastic work!",
+    "The elves are so excited! They just told me that {name} is on the nice list! They've been watching and you've been so good!"
+)
+
+# ElevenLabs voice for Santa (default is the Santa voice from the SignalWire guide)
+SANTA_VOICE: Final[str] = "elevenlabs." + os.getenv('ELEVENLABS_VOICE_ID', 'uDsPstFWFBUXjIBimV7s')
+
+# Speech hints for better recognition of holiday terms
+HINTS: Final[Tuple[str, ...]] = (
+    "toy", "toys", "game", "games", "doll", "dolls",
+    "lego", "puzzle", "bicycle", "bike", "scooter",
+    "christmas", "present", "gift", "santa", "elves",
+    "nice", "naughty", "list", "workshop", "north pole",
+    "yes", "no", "please", "thank you",
+    "option one", "option two", "option three",
+    "first", "second", "third"
+)
+
+
+# JSON schemas for the SWAIG tool parameters
+SEARCH_GIFTS_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "query": {
+            "type": "string",
+            "description": "What to search for (e.g., 'lego sets', 'dolls', 'video games for kids')"
+        },
+        "child_age": {
+            "type": "integer",
+            "description": "Approximate age of the child (optional)",
+            "minimum": 3,
+            "maximum": 16
+        }
+    },
+    "required": ["query"]
+}
+
+SELECT_GIFT_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "gift_choice": {
+            "type": "integer",
+            "description": "The option number (1, 2, 3, or 4)",
+            "minimum": 1,
+            "maximum": 4
+        }
+    },
+    "required": ["gift_choice"]
+}
+
+CHECK_NICE_LIST_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "name": {
+            "type": "string",
+            "description": "The child's name"
+        }
+    },
+    "required": ["name"]
+}
+
+
+# Mock catalog used when RapidAPI is unavailable, keyed by query keyword
+MOCK_PRODUCTS = {
+    "lego": [
+        {
+            'title': 'LEGO Classic Creative Bricks Set',
+            'price': '$29.99',
+            'image': 'https://via.placeholder.com/300x300?text=LEGO+Set',
+            'url': '#',
+            'description': 'Build anything you can imagine with this classic LEGO set!'
+        },
+        {
+            'title': 'LEGO City Police Station',
+            'price': '$79.99',
+            'image': 'https://via.placeholder.com/300x300?text=Police+Station',
+            'url': '#',
+            'description': 'Complete police station with vehicles and minifigures'
+        },
+        {
+            'title': 'LEGO Friends Heartlake City',
+            'price': '$49.99',
+            'image': 'https://via.placeholder.com/300x300?text=LEGO+Friends',
+            'url': '#',
+            'description': 'Build and play in Heartlake City with friends'
+        }
+    ],
+    "doll": [
+        {
+            'title': 'American Girl Doll - Holiday Edition',
+            'price': '$98.00',
+            'image': 'https://via.placeholder.com/300x300?text=American+Girl',
+            'url': '#',
+            'description': 'Beautiful holiday-themed American Girl doll'
+        },
+        {
+            'title': 'Barbie Dreamhouse Playset',
+            'price': '$89.99',
+            'image': 'https://via.placeholder.com/300x300?text=Barbie+Dreamhouse',
+            'url': '#',
+            'description': 'Three-story Barbie dreamhouse with elevator'
+        },
+        {
+            'title': 'Baby Alive Doll',
+            'price': '$34.99',
+            'image': 'https://via.placeholder.com/300x300?text=Baby+Alive',
+            'url': '#',
+            'description': 'Interactive baby doll that eats, drinks, and more'
+        }
+    ]
+}
+
+# Matches the first mock catalog keyword appearing in a lowercased query
+MOCK_PRODUCT_PATTERN = re.compile("|".join(map(re.escape, MOCK_PRODUCTS)))
+
+# Pulls the dollar amount out of RapidAPI prices like "$1,299.99" or "$15.00 - $20.00"
+PRICE_PATTERN = re.compile(r'\$\s*([0-9][0-9,]*(?:\.[0-9]+)?)')
+
+# Cache-Control for static assets by extension. Videos, audio and images are
+# large and rarely change; pages, scripts and styles revalidate via ETag so
+# a deploy shows up on the next load. Names aren't fingerprinted, so nothing
+# is marked immutable.
+STATIC_CACHE_CONTROL = {
+    '.mp4': 'public, max-age=86400',
+    '.mp3': 'public, max-age=86400',
+    '.png': 'public, max-age=86400',
+    '.html': 'no-cache',
+    '.js': 'no-cache',
+    '.css': 'no-cache',
+}
+
+# Headers a 304 must repeat from the 200 it stands in for (RFC 9110 15.4.5).
+# Vary matters because gzip sits inside the cache middleware: without it a
+# shared cache could mix up the compressed and plain copies.
+NOT_MODIFIED_HEADERS = frozenset({
+    b'cache-control', b'content-location', b'date', b'etag', b'expires',
+    b'last-modified', b'vary',
+})
+
+# Static files that are already compressed and gain nothing from gzip
+PRECOMPRESSED_EXTENSIONS = frozenset({'.mp4', '.mp3', '.png'})
+
+# Hostnames served over plain HTTP during local development
+LOCAL_HOSTS = frozenset({'localhost', '127.0.0.1', '0.0.0.0', '[::1]'})
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves already-compressed media untouched"""
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and os.path.splitext(scope['path'])[1].lower() in PRECOMPRESSED_EXTENSIONS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+class StaticCacheMiddleware:
+    """ASGI middleware adding Cache-Control to static files and answering ETag revalidation with 304"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD'):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope['path']
+        cache_control = STATIC_CACHE_CONTROL.get('.html' if path == '/' else os.path.splitext(path)[1].lower())
+        if cache_control is None:
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get('if-none-match')
+        not_modified = False
+
+        async def send_with_cache_headers(message):
+            nonlocal not_modified
+            if message['type'] == 'http.response.start':
+                if message['status'] not in (200, 206):
+                    await send(message)
+                    return
+                headers = MutableHeaders(scope=message)
+                headers['cache-control'] = cache_control
+                etag = headers.get('etag')
+                if message['status'] == 200 and if_none_match and etag and etag_matches(if_none_match, etag):
+                    not_modified = True
+                    message = {
+                        'type': 'http.response.start',
+                        'status': 304,
+                        'headers': [(k, v) for k, v in message['headers']
+                                    if k in NOT_MODIFIED_HEADERS]
+                    }
+            elif not_modified:
+                # Swallow the file body; a 304 carries none
+                if message.get('more_body', False):
+                    return
+                message = {'type': 'http.response.body', 'body': b''}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cache_headers)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against a response ETag (weak comparison)"""
+    if if_none_match.strip() == '*':
+        return True
+    etag = etag.removeprefix('W/')
+    return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
+
+
+def hostname_of(host: str) -> str:
+    """Strip the port from a Host header value, keeping IPv6 brackets"""
+    if host.startswith('['):
+        return host[:host.find(']') + 1]
+    return host.partition(':')[0].lower()
+
+
+# Bounded because the Host header is client-controlled
+@lru_cache(maxsize=32)
+def media_urls(protocol: str, host: str) -> Tuple[str, str, str]:
+    """Build the (idle video, talking video, background music) URLs for a host"""
+    base_url = protocol + "://" + host
+    return (
+        base_url + "/santa_idle.mp4",
+        base_url + "/santa_talking.mp4",
+        base_url + "/background.mp3",
+    )
+
+
+class RateLimiter:
+    """Spaces out calls so no more than `rate` start in any one second"""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: float) -> bool:
+        """Wait for the next call slot, or return False if it's more than max_wait away"""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            if delay > max_wait:
+                return False
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+
+class SearchCache:
+    """Small thread-safe LRU cache whose entries expire after `ttl` seconds"""
+
+    def __init__(self, maxsize: int = 512, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: List[Dict]):
+        """Store value under key, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
 class SantaAIAgent(AgentBase):
     """Santa Claus - Your Christmas Gift Selection Assistant"""
 
@@ -33,6 +410,37 @@ class SantaAIAgent(AgentBase):
         self.rapidapi_key = os.getenv('RAPIDAPI_KEY')
         self.rapidapi_host = os.getenv('RAPIDAPI_HOST', 'real-time-amazon-data.p.rapidapi.com')
 
+        # Search endpoint and the fixed query parameters from the curl example;
+        # each search only adds its own 'query'
+        self._rapidapi_url = 'https://real-time-amazon-data.p.rapidapi.com/search'
+        self._rapidapi_params = MappingProxyType({
+            'page': '1',
+            'country': 'US',
+            'sort_by': 'RELEVANCE',
+            'product_condition': 'ALL',
+            'is_prime': 'false',
+            'deals_and_discounts': 'NONE'
+        })
+
+        # Shared HTTP session so RapidAPI calls reuse keep-alive connections
+        # instead of paying for DNS, TCP and TLS setup on every search
+        self._http = requests.Session()
+        # Use lowercase headers with x- prefix as shown in the curl example
+        self._http.headers.update({
+            'x-rapidapi-host': 'real-time-amazon-data.p.rapidapi.com',
+            'x-rapidapi-key': self.rapidapi_key
+        })
+        # No retries: searches block the event loop, and a 429 or 5xx (often a
+        # 504 arriving near the read timeout) falls back to mock products faster
+        # than a second attempt could succeed
+        self._http.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0))
+
+        # Stay under the RapidAPI plan's request quota
+        self._rapidapi_limiter = RateLimiter(float(os.getenv('RAPIDAPI_RPS', '5')))
+
+        # Remember recent searches so repeat wishes ("lego sets") skip the API call
+        self._search_cache = SearchCache(ttl=float(os.getenv('SEARCH_CACHE_TTL', '3600')))
+
         # Gift price limits
         self.min_price = float(os.getenv('MIN_GIFT_PRICE', '10.00'))
         self.max_price = float(os.getenv('MAX_GIFT_PRICE', '100.00'))
@@ -40,9 +448,19 @@ class SantaAIAgent(AgentBase):
         # Christmas year
         self.christmas_year = os.getenv('CHRISTMAS_YEAR', '2025')
 
+        # Optional fixed video URLs; unset ones are served from the request host
+        self._video_idle_url = os.getenv('VIDEO_IDLE_URL')
+        self._video_talking_url = os.getenv('VIDEO_TALKING_URL')
+
+        # (protocol, host) the media URL params were last built for
+        self._media_host: Optional[Tuple[str, str]] = None
+
         # Initialize conversation prompts
         self._initialize_prompts()
 
+        # Configure Santa's voice and speech recognition
+        self._initialize_speech()
+
         # Set up SWAIG functions
         self._setup_functions()
 
@@ -50,64 +468,36 @@ class SantaAIAgent(AgentBase):
         """Initialize Santa's personality and conversation prompts"""
 
         # Santa's personality
-        self.prompt_add_section(
-            "Personality",
-            """You are Santa Claus, speaking directly to a child who has called you at the North Pole.
-            You're jolly, warm, and magical. You love to hear what children want for Christmas and help them
-            choose the perfect gift. Use phrases like "Ho ho ho!", "Merry Christmas!", and refer to your
-            workshop, elves, and reindeer. Keep responses cheerful but concise - remember you're having
-            a phone conversation with an excited child."""
-        )
+        self.prompt_add_section("Personality", PROMPT_PERSONALITY)
 
         # Conversation states
-        self.prompt_add_section(
-            "Conversation Flow",
-            """Follow these conversation states:
-
-            1. GREETING: Welcome the child warmly, ask their name, and find out what they'd like for Christmas
-            2. COLLECTING_WISHES: Listen to what gifts they're interested in, ask clarifying questions if needed
-            3. SEARCHING_GIFTS: Let them know you're checking your workshop and Amazon's catalog
-            4. PRESENTING_OPTIONS: Present up to 3 gift options enthusiastically
-            5. CONFIRMING_SELECTION: Help them choose ONE gift (gently explain they can only pick one)
-            6. SENDING_GIFT: Confirm you'll send the gift details to their parents
-
-            Always maintain the magic of Christmas and never break character."""
-        )
+        self.prompt_add_section("Conversation Flow", PROMPT_CONVERSATION_FLOW)
 
         # Natural filler words for realistic speech
-        self.prompt_add_section(
-            "Speech Patterns",
-            """Use natural speech patterns including:
-            - "Ho ho ho!" when greeting or expressing joy
-            - "Let me check my list..." when searching
-            - "Oh my!" when surprised
-            - "Wonderful choice!" when they select something
-            - "The elves will love making this!" when confirming
-
-            Add natural pauses with filler words like "hmm", "let's see", "ah yes" to sound more natural."""
-        )
+        self.prompt_add_section("Speech Patterns", PROMPT_SPEECH_PATTERNS)
 
         # Available Tools section - CRITICAL for the AI to use functions
-        self.prompt_add_section(
-            "Available Tools",
-            """You have access to these magical tools to help children:
-
-            1. search_gifts - Use this when a child tells you what they want for Christmas.
-               This searches both Santa's workshop and Amazon's catalog.
-               Example: If a child says "I want Legos", use search_gifts with query="lego sets"
+        self.prompt_add_section("Available Tools", PROMPT_AVAILABLE_TOOLS)
 
-            2. select_gift - Use this after presenting options to confirm which gift they chose.
-               This records their selection and shows it on the screen.
+        # Optional post-prompt URL from environment
+        post_prompt_url = os.environ.get("POST_PROMPT_URL")
+        if post_prompt_url:
+            self.set_post_prompt(POST_PROMPT_TEXT)
+            self.set_post_prompt_url(post_prompt_url)
 
-            3. check_nice_list - Use this when a child asks if they're on the nice list or
-               when you want to check their behavior status. Always use their name.
+    def _initialize_speech(self):
+        """Configure Santa's voice and speech recognition hints"""
 
-            IMPORTANT: You MUST use these tools during the conversation!
-            - When a child mentions what they want → use search_gifts
-            - After they pick from options → use select_gift
-            - When checking nice list → use check_nice_list"""
+        # Configure Santa voice as part of language settings (like holyguacamole)
+        self.add_language(
+            name="English",
+            code="en-US",
+            voice=SANTA_VOICE
         )
 
+        # Add speech hints for better recognition of holiday terms
+        self.add_hints(list(HINTS))
+
     def _setup_functions(self):
         """Set up SWAIG functions for gift selection"""
 
@@ -132,22 +522,7 @@ class SantaAIAgent(AgentBase):
         @self.tool(
             name="search_gifts",
             description="Search for gift ideas based on what the child wants",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "What to search for (e.g., 'lego sets', 'dolls', 'video games for kids')"
-                    },
-                    "child_age": {
-                        "type": "integer",
-                        "description": "Approximate age of the child (optional)",
-                        "minimum": 3,
-                        "maximum": 16
-                    }
-                },
-                "required": ["query"]
-            }
+            parameters=SEARCH_GIFTS_PARAMETERS
         )
         def search_gifts(args, raw_data):
             """Search Amazon for gift ideas using RapidAPI"""
@@ -168,13 +543,13 @@ class SantaAIAgent(AgentBase):
             # The user will specify if they want kids items
 
             # Debug the search
-            print(f"DEBUG SWAIG: search_gifts called with query='{query}', age={child_age}")
+            logger.debug("SWAIG: search_gifts called with query='%s', age=%s", query, child_age)
 
             # Call RapidAPI
             products = self._search_amazon_products(query)
 
             if not products:
-                print("DEBUG SWAIG: No products returned from search")
+                logger.debug("SWAIG: No products returned from search")
                 result = SwaigFunctionResult("Oh dear! I'm having trouble reaching my workshop catalog right now. Let me check again... Can you tell me more about what kind of gift you're looking for?")
 
                 # Update gift state
@@ -190,11 +565,15 @@ class SantaAIAgent(AgentBase):
                 })
 
                 # Debug dump the complete result
-                print("\n=== SWAIG RESULT DUMP (search_gifts - FAILED) ===")
-                print(f"Response Text: Search failed message")
-                print(f"Query: {query}")
-                print(f"Event Sent: search_failed")
-                print("=== END RESULT DUMP ===\n")
+                if SANTA_DEBUG:
+                    logger.debug(
+                        "\n=== SWAIG RESULT DUMP (search_gifts - FAILED) ===\n"
+                        "Response Text: Search failed message\n"
+                        "Query: %s\n"
+                        "Event Sent: search_failed\n"
+                        "=== END RESULT DUMP ===\n",
+                        query
+                    )
 
                 return result
 
@@ -203,6 +582,8 @@ class SantaAIAgent(AgentBase):
             response_text = "Ho ho ho! I found some wonderful gifts that would be perfect! Let me tell you about each one:\n\n"
 
             for i, product in enumerate(products[:4], 1):
+                description = product['description'][:200] if product.get('description') else f"{product.get('title', 'Gift')} - Perfect for children!"
+
                 # Build gift data for frontend
                 gift_item = {
                     'id': i,
@@ -210,7 +591,7 @@ class SantaAIAgent(AgentBase):
                     'price': product.get('price', 'Price upon request'),
                     'image': product.get('image', ''),
                     'url': product.get('url', ''),
-                    'description': product.get('description', '')[:200] if product.get('description') else f"{product.get('title', 'Gift')} - Perfect for children!",
+                    'description': description,
                     'rating': product.get('rating', ''),
                     'asin': product.get('asin', '')
                 }
@@ -223,17 +604,17 @@ class SantaAIAgent(AgentBase):
                 if gift_item.get('rating'):
                     response_text += f"   Rating: {gift_item['rating']} stars\n"
 
-                if gift_item.get('description'):
-                    response_text += f"   Description: {gift_item['description'][:100]}...\n"
+                response_text += f"   Description: {product.get('description_short') or description[:100]}...\n"
 
                 response_text += "\n"
 
             response_text += "I can see all these wonderful gifts on my magical display here at the North Pole! "
             response_text += "Which one would you like? Just tell me the number - option 1, 2, 3, or 4!"
 
-            print(f"DEBUG SWAIG: Found {len(gift_data)} gifts, sending to frontend")
-            print(f"DEBUG SWAIG: Gift data being sent: {[g['title'] for g in gift_data]}")
-            print(f"DEBUG SWAIG: Full response text for LLM:\n{response_text}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("SWAIG: Found %d gifts, sending to frontend", len(gift_data))
+                logger.debug("SWAIG: Gift data being sent: %s", [g['title'] for g in gift_data])
+                logger.debug("SWAIG: Full response text for LLM:\n%s", response_text)
 
             # Create the result with the detailed response text for the LLM
             result = SwaigFunctionResult(response_text)
@@ -248,65 +629,62 @@ class SantaAIAgent(AgentBase):
             result.swml_change_step("presenting_options")
 
             # Send to frontend using swml_user_event (Option A)
-            print(f"DEBUG SWAIG: Sending user_event with {len(gift_data)} gifts to UI")
+            logger.debug("SWAIG: Sending user_event with %d gifts to UI", len(gift_data))
             result.swml_user_event({
                 'type': 'gifts_found',  # Changed from 'event_type' to match holyguacamole
                 'gifts': gift_data,
                 'query': query
             })
 
-            print("DEBUG SWAIG: COMPLETE DATA BEING RETURNED TO LLM:")
-            print(f"  - Response text length: {len(response_text)} chars")
-            print(f"  - Global data stored: gift_search_results with {len(gift_data)} items")
-            print(f"  - User event sent: gifts_found with product details")
+            logger.debug(
+                "SWAIG: COMPLETE DATA BEING RETURNED TO LLM:\n"
+                "  - Response text length: %d chars\n"
+                "  - Global data stored: gift_search_results with %d items\n"
+                "  - User event sent: gifts_found with product details",
+                len(response_text), len(gift_data)
+            )
 
             # Debug dump the complete result
-            print("\n=== SWAIG RESULT DUMP (search_gifts) ===")
-            print(f"Response Text:\n{response_text}")
-            print(f"Global Data: {gift_data}")
-            print("=== END RESULT DUMP ===\n")
+            if SANTA_DEBUG:
+                logger.debug(
+                    "\n=== SWAIG RESULT DUMP (search_gifts) ===\n"
+                    "Response Text:\n%s\n"
+                    "Global Data: %s\n"
+                    "=== END RESULT DUMP ===\n",
+                    response_text, gift_data
+                )
 
             return result
 
         @self.tool(
             name="select_gift",
             description="Select a specific gift from the search results",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "gift_choice": {
-                        "type": "integer",
-                        "description": "The option number (1, 2, 3, or 4)",
-                        "minimum": 1,
-                        "maximum": 4
-                    }
-                },
-                "required": ["gift_choice"]
-            }
+            parameters=SELECT_GIFT_PARAMETERS
         )
         def select_gift(args, raw_data):
             """Confirm the child's gift selection"""
             choice = args.get('gift_choice')
 
-            print(f"DEBUG SWAIG: select_gift called with choice={choice}")
+            logger.debug("SWAIG: select_gift called with choice=%s", choice)
 
             # Get current state
             gift_state, global_data = get_gift_state(raw_data)
             gift_results = gift_state.get('gift_search_results', [])
 
-            print(f"DEBUG SWAIG: Available gifts in session: {[g.get('title', 'Unknown') for g in gift_results]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("SWAIG: Available gifts in session: %s", [g.get('title', 'Unknown') for g in gift_results])
 
             if not gift_results:
-                print("DEBUG SWAIG: No gift results in session")
+                logger.debug("SWAIG: No gift results in session")
                 return SwaigFunctionResult("Oh my! I need to search for gifts first. What kind of gift would you like for Christmas?")
 
             if choice > len(gift_results) or choice < 1:
-                print(f"DEBUG SWAIG: Invalid choice {choice}, valid range is 1-{len(gift_results)}")
+                logger.debug("SWAIG: Invalid choice %s, valid range is 1-%d", choice, len(gift_results))
                 return SwaigFunctionResult(f"Oh my! I don't see option {choice}. Please choose from options 1 to {len(gift_results)}. Which one would you like?")
 
             selected_gift = gift_results[choice - 1]
 
-            print(f"DEBUG SWAIG: Gift selected: {selected_gift['title']} at {selected_gift.get('price', 'N/A')}")
+            logger.debug("SWAIG: Gift selected: %s at %s", selected_gift['title'], selected_gift.get('price', 'N/A'))
 
             # Provide complete details for the LLM to speak about the selection
             response_text = f"Ho ho ho! What a wonderful choice! You've selected:\n\n"
@@ -335,53 +713,41 @@ class SantaAIAgent(AgentBase):
             result.swml_change_step("gift_confirmed")
 
             # Send to frontend using swml_user_event (Option A)
-            print(f"DEBUG SWAIG: Sending gift_selected event to UI with gift id={choice}")
+            logger.debug("SWAIG: Sending gift_selected event to UI with gift id=%s", choice)
             result.swml_user_event({
                 'type': 'gift_selected',  # Changed from 'event_type' to match holyguacamole
                 'gift': selected_gift
             })
 
             # Debug dump the complete result
-            print("\n=== SWAIG RESULT DUMP (select_gift) ===")
-            print(f"Response Text:\n{response_text}")
-            print(f"Selected Gift: {selected_gift}")
-            print(f"Session Data Stored: selected_gift, state='gift_confirmed'")
-            print("=== END RESULT DUMP ===\n")
+            if SANTA_DEBUG:
+                logger.debug(
+                    "\n=== SWAIG RESULT DUMP (select_gift) ===\n"
+                    "Response Text:\n%s\n"
+                    "Selected Gift: %s\n"
+                    "Session Data Stored: selected_gift, state='gift_confirmed'\n"
+                    "=== END RESULT DUMP ===\n",
+                    response_text, selected_gift
+                )
 
             return result
 
         @self.tool(
             name="check_nice_list",
             description="Check if a child is on the nice list",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "The child's name"
-                    }
-                },
-                "required": ["name"]
-            }
+            parameters=CHECK_NICE_LIST_PARAMETERS
         )
         def check_nice_list(args, raw_data):
             """Fun function to check if child is on the nice list"""
             name = args.get('name', 'dear child')
 
-            print(f"DEBUG SWAIG: Checking nice list for: {name}")
+            logger.debug("SWAIG: Checking nice list for: %s", name)
 
             # Get current state
             gift_state, global_data = get_gift_state(raw_data)
 
             # Always positive and encouraging!
-            responses = [
-                f"Let me check my big magical book here at the North Pole... *pages rustling*... Oh yes! I found it! {name} is definitely on the NICE LIST! You've been wonderful this year!",
-                f"Ho ho ho! {name}! Let me see... *checking list twice*... YES! You're on my nice list! I can see all the kind things you've done this year!",
-                f"My special list says {name} has been absolutely wonderful! The elves have been telling me such good things about you! Keep up the fantastic work!",
-                f"The elves are so excited! They just told me that {name} is on the nice list! They've been watching and you've been so good!"
-            ]
-
-            response_text = random.choice(responses)
+            response_text = random.choice(NICE_LIST_TEMPLATES).format(name=name)
             response_text += f"\n\n✨ {name} - NICE LIST STATUS: CONFIRMED! ✨"
             response_text += "\n\nYou're going to have a magical Christmas!"
 
@@ -400,11 +766,15 @@ class SantaAIAgent(AgentBase):
             })
 
             # Debug dump the complete result
-            print("\n=== SWAIG RESULT DUMP (check_nice_list) ===")
-            print(f"Response Text:\n{response_text}")
-            print(f"Name Checked: {name}")
-            print(f"Event Sent: nice_list_checked")
-            print("=== END RESULT DUMP ===\n")
+            if SANTA_DEBUG:
+                logger.debug(
+                    "\n=== SWAIG RESULT DUMP (check_nice_list) ===\n"
+                    "Response Text:\n%s\n"
+                    "Name Checked: %s\n"
+                    "Event Sent: nice_list_checked\n"
+                    "=== END RESULT DUMP ===\n",
+                    response_text, name
+                )
 
             return result
 
@@ -412,173 +782,117 @@ class SantaAIAgent(AgentBase):
         """Search Amazon products using RapidAPI"""
 
         if not self.rapidapi_key:
-            print("Warning: RapidAPI key not configured")
+            logger.warning("RapidAPI key not configured")
             return self._get_mock_products(query)
 
-        url = 'https://real-time-amazon-data.p.rapidapi.com/search'
-
-        # Use lowercase headers with x- prefix as shown in the curl example
-        headers = {
-            'x-rapidapi-host': 'real-time-amazon-data.p.rapidapi.com',
-            'x-rapidapi-key': self.rapidapi_key
-        }
+        cache_key = query.strip().lower()
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Returning cached products for '%s'", query)
+            return cached
 
-        # Match the exact query parameters from the curl example
-        params = {
-            'query': query,
-            'page': '1',
-            'country': 'US',
-            'sort_by': 'RELEVANCE',
-            'product_condition': 'ALL',
-            'is_prime': 'false',
-            'deals_and_discounts': 'NONE'
-        }
+        url = self._rapidapi_url
+        params = {**self._rapidapi_params, 'query': query}
 
         try:
-            print(f"DEBUG: RapidAPI Search Query: '{query}'")
-            print(f"DEBUG: Request URL: {url}")
-            print(f"DEBUG: Request params: {params}")
+            logger.debug("RapidAPI Search Query: '%s'", query)
+            logger.debug("Request URL: %s", url)
+            logger.debug("Request params: %s", params)
 
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            if not self._rapidapi_limiter.acquire(RAPIDAPI_MAX_WAIT):
+                logger.warning("RapidAPI rate limit reached, using mock products for '%s'", query)
+                return self._get_mock_products(query)
+            response = self._http.get(url, params=params, timeout=RAPIDAPI_TIMEOUT)
 
-            print(f"DEBUG: RapidAPI Response Status: {response.status_code}")
+            logger.debug("RapidAPI Response Status: %s", response.status_code)
 
             if response.status_code == 200:
-                data = response.json()
-                products = []
+                data = orjson.loads(response.content)
 
                 # Debug: Print the structure of the response
-                print(f"DEBUG: Response keys: {data.keys()}")
+                logger.debug("Response keys: %s", data.keys())
 
                 # The API returns data in data.products array
                 product_list = data.get('data', {}).get('products', [])
 
-                print(f"DEBUG: Found {len(product_list)} products from Amazon")
+                logger.debug("Found %d products from Amazon", len(product_list))
 
                 # Debug: Print first product structure if available
                 if product_list:
-                    print(f"DEBUG: First product keys: {product_list[0].keys()}")
-
-                for item in product_list[:10]:  # Check more items to find suitable ones
-                    # Extract product details
-                    title = item.get('product_title', '')
-                    price_str = item.get('product_price', '')
-                    image = item.get('product_photo', '')
-                    url = item.get('product_url', '')
-                    asin = item.get('asin', '')
-                    rating = item.get('product_star_rating', '')
-
-                    # Skip if no title or image
-                    if not title or not image:
-                        continue
-
-                    # Try to extract numeric price for filtering
-                    try:
-                        if price_str and '$' in price_str:
-                            # Extract price (e.g., "$29.99" -> 29.99)
-                            price_num = float(price_str.replace('$', '').replace(',', '').split()[0])
-
-                            # Skip if outside price range
-                            if price_num < self.min_price or price_num > self.max_price:
-                                continue
-                    except:
-                        # Include items even if we can't parse the price
-                        pass
-
-                    product_data = {
-                        'title': title,
-                        'price': price_str or 'Price not available',
-                        'image': image,
-                        'url': url or f'https://www.amazon.com/dp/{asin}' if asin else '#',
-                        'description': item.get('product_description', '')[:200] if item.get('product_description') else f"{title} - Great gift for kids!",
-                        'rating': rating,
-                        'asin': asin
-                    }
+                    logger.debug("First product keys: %s", product_list[0].keys())
 
-                    products.append(product_data)
+                # Check the first 10 items and keep the first 3 suitable ones
+                candidates = (self._extract_product(item) for item in itertools.islice(product_list, 10))
+                products = list(itertools.islice(filter(None, candidates), 3))
 
-                    # Debug log the product being added
-                    print(f"DEBUG: Added product #{len(products)}: {title[:50]}... Price: {price_str}, Has Image: {bool(image)}")
-
-                    # Stop when we have 3 suitable products
-                    if len(products) >= 3:
-                        break
-
-                print(f"DEBUG: Returning {len(products)} products after filtering")
+                logger.debug("Returning %d products after filtering", len(products))
 
                 # Debug log the final products
-                for i, prod in enumerate(products, 1):
-                    print(f"DEBUG: Product {i}: {prod['title'][:50]}... | ${prod['price']} | Image: {bool(prod['image'])}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    for i, prod in enumerate(products, 1):
+                        logger.debug("Product %d: %.50s... | $%s | Image: %s", i, prod['title'], prod['price'], bool(prod['image']))
 
-                return products[:3]
+                if products:
+                    self._search_cache.set(cache_key, products)
+                return products
             else:
-                print(f"RapidAPI Error Response: {response.text}")
+                logger.error("RapidAPI Error Response: %s", response.text)
 
         except requests.exceptions.RequestException as e:
-            print(f"Request error searching Amazon: {e}")
+            logger.error("Request error searching Amazon: %s", e)
         except Exception as e:
-            print(f"Error parsing Amazon response: {e}")
+            logger.error("Error parsing Amazon response: %s", e)
 
         # Return mock data if API fails
         return self._get_mock_products(query)
 
+    def _extract_product(self, item: Dict) -> Optional[Dict]:
+        """Build a gift entry from a RapidAPI product, or None if it isn't suitable"""
+        title = item.get('product_title', '')
+        price_str = item.get('product_price', '')
+        image = item.get('product_photo', '')
+        url = item.get('product_url', '')
+        asin = item.get('asin', '')
+        rating = item.get('product_star_rating', '')
+        description = item.get('product_description') or f"{title} - Great gift for kids!"
+
+        # Skip if no title or image
+        if not title or not image:
+            return None
+
+        # Extract numeric price for filtering (e.g., "$29.99" -> 29.99)
+        # Items without a parseable dollar price are still included
+        price_match = PRICE_PATTERN.search(price_str) if isinstance(price_str, str) else None
+        if price_match:
+            price_num = float(price_match.group(1).replace(',', ''))
+
+            # Skip if outside price range
+            if price_num < self.min_price or price_num > self.max_price:
+                return None
+
+        return {
+            'title': title,
+            'price': price_str or 'Price not available',
+            'image': image,
+            'url': url or f'https://www.amazon.com/dp/{asin}' if asin else '#',
+            # Truncate once here: full-length for the UI, short for Santa's spoken summary
+            'description': description[:200],
+            'description_short': description[:100],
+            'rating': rating,
+            'asin': asin
+        }
+
+    def close(self):
+        """Release pooled RapidAPI connections"""
+        self._http.close()
+
     def _get_mock_products(self, query: str) -> List[Dict]:
         """Return mock products for testing when API is unavailable"""
 
-        mock_products = {
-            "lego": [
-                {
-                    'title': 'LEGO Classic Creative Bricks Set',
-                    'price': '$29.99',
-                    'image': 'https://via.placeholder.com/300x300?text=LEGO+Set',
-                    'url': '#',
-                    'description': 'Build anything you can imagine with this classic LEGO set!'
-                },
-                {
-                    'title': 'LEGO City Police Station',
-                    'price': '$79.99',
-                    'image': 'https://via.placeholder.com/300x300?text=Police+Station',
-                    'url': '#',
-                    'description': 'Complete police station with vehicles and minifigures'
-                },
-                {
-                    'title': 'LEGO Friends Heartlake City',
-                    'price': '$49.99',
-                    'image': 'https://via.placeholder.com/300x300?text=LEGO+Friends',
-                    'url': '#',
-                    'description': 'Build and play in Heartlake City with friends'
-                }
-            ],
-            "doll": [
-                {
-                    'title': 'American Girl Doll - Holiday Edition',
-                    'price': '$98.00',
-                    'image': 'https://via.placeholder.com/300x300?text=American+Girl',
-                    'url': '#',
-                    'description': 'Beautiful holiday-themed American Girl doll'
-                },
-                {
-                    'title': 'Barbie Dreamhouse Playset',
-                    'price': '$89.99',
-                    'image': 'https://via.placeholder.com/300x300?text=Barbie+Dreamhouse',
-                    'url': '#',
-                    'description': 'Three-story Barbie dreamhouse with elevator'
-                },
-                {
-                    'title': 'Baby Alive Doll',
-                    'price': '$34.99',
-                    'image': 'https://via.placeholder.com/300x300?text=Baby+Alive',
-                    'url': '#',
-                    'description': 'Interactive baby doll that eats, drinks, and more'
-                }
-            ]
-        }
-
         # Return relevant mock products based on query
-        query_lower = query.lower()
-        for key, products in mock_products.items():
-            if key in query_lower:
-                return products
+        match = MOCK_PRODUCT_PATTERN.search(query.lower())
+        if match:
+            return MOCK_PRODUCTS[match.group(0)]
 
         # Default mock products
         return [
@@ -600,60 +914,30 @@ class SantaAIAgent(AgentBase):
         protocol = "http"
 
         if request:
-            # Try to get the host from headers
-            headers = {k.lower(): v for k, v in request.headers.items()}
-            host = headers.get('host', host)
+            # Try to get the host from headers (Starlette headers are case-insensitive)
+            host = request.headers.get('host') or host
 
             # Check if we're behind a proxy with x-forwarded-proto
-            protocol = headers.get('x-forwarded-proto', 'https')
+            protocol = request.headers.get('x-forwarded-proto', 'https')
 
             # Override protocol for local development
-            if 'localhost' in host or '127.0.0.1' in host:
+            if hostname_of(host) in LOCAL_HOSTS:
                 protocol = 'http'
 
         # Set video URLs using set_param (this is what makes video work!)
-        if host:
-            base_url = f"{protocol}://{host}"
-            self.set_param("video_idle_file", f"{base_url}/santa_idle.mp4")
-            self.set_param("video_talking_file", f"{base_url}/santa_talking.mp4")
-            # Add background music for festive atmosphere
-            self.set_param("background_file", f"{base_url}/background.mp3")
-            self.set_param("background_file_volume", -10)
-            print(f"Set video URLs to use host: {base_url}")
-        else:
-            # Fallback to environment variables or defaults
-            video_idle = os.getenv('VIDEO_IDLE_URL', f"{protocol}://{host}/santa_idle.mp4")
-            video_talking = os.getenv('VIDEO_TALKING_URL', f"{protocol}://{host}/santa_talking.mp4")
-            self.set_param("video_idle_file", video_idle)
-            self.set_param("video_talking_file", video_talking)
-            # Add background music for festive atmosphere
-            self.set_param("background_file", f"{protocol}://{host}/background.mp3")
-            self.set_param("background_file_volume", -10)
-
-        # Configure Santa voice as part of language settings (like holyguacamole)
-        voice_id = 'uDsPstFWFBUXjIBimV7s'  # Santa voice from SignalWire guide
-        self.add_language(
-            name="English",
-            code="en-US",
-            voice=f"elevenlabs.{voice_id}"
-        )
-
-        # Optional post-prompt URL from environment
-        post_prompt_url = os.environ.get("POST_PROMPT_URL")
-        if post_prompt_url:
-            self.set_post_prompt("Summarize the conversation, including all the gifts discussed, the child's preferences, their selected gift if any, and any special mentions about their Christmas wishes.")
-            self.set_post_prompt_url(post_prompt_url)
-
-        # Add speech hints for better recognition of holiday terms
-        self.add_hints([
-            "toy", "toys", "game", "games", "doll", "dolls",
-            "lego", "puzzle", "bicycle", "bike", "scooter",
-            "christmas", "present", "gift", "santa", "elves",
-            "nice", "naughty", "list", "workshop", "north pole",
-            "yes", "no", "please", "thank you",
-            "option one", "option two", "option three",
-            "first", "second", "third"
-        ])
+        # Calls nearly always arrive on the same public host, so the params
+        # are only rebuilt when the host or protocol changes
+        if (protocol, host) != self._media_host:
+            video_idle, video_talking, background = media_urls(protocol, host)
+            self.set_params({
+                "video_idle_file": self._video_idle_url or video_idle,
+                "video_talking_file": self._video_talking_url or video_talking,
+                # Add background music for festive atmosphere
+                "background_file": background,
+                "background_file_volume": -10,
+            })
+            self._media_host = (protocol, host)
+            logger.debug("Set video URLs to use host: %s://%s", protocol, host)
 
         # Call parent implementation to handle the SWML request
         return super().on_swml_request(request_data, callback_path, request)
@@ -661,13 +945,26 @@ class SantaAIAgent(AgentBase):
 
 def create_server():
     """Create AgentServer with static file mounting."""
-    server = AgentServer(host=HOST, port=PORT)
-    server.register(SantaAIAgent(), "/santa")
+    server = AgentServer(host=HOST, port=PORT, log_level=UVICORN_LOG_LEVEL)
+
+    # Serialize JSON responses (SWAIG results, /health) with orjson. This must
+    # be set before routes are registered so they pick it up as their default.
+    server.app.router.default_response_class = ORJSONResponse
+
+    # Compress SWML, SWAIG results and text assets for clients that accept gzip
+    server.app.add_middleware(SelectiveGZipMiddleware, minimum_size=512, compresslevel=5)
+
+    agent = SantaAIAgent()
+    server.register(agent, "/santa")
+
+    # Close Santa's pooled HTTP connections when the server shuts down
+    server.app.add_event_handler("shutdown", agent.close)
 
     # Serve static files using SDK's built-in method
     web_dir = Path(__file__).parent / "web"
     if web_dir.exists():
         server.serve_static_files(str(web_dir))
+        server.app.add_middleware(StaticCacheMiddleware)
 
     return server
 